@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import os
+import uuid
+import redis.asyncio as redis
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+# Cache settings, read from the environment once at import.
+# Caching is disabled when REDIS_URL is unset.
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL = int(os.getenv("CACHE_TTL", 60))  # Seconds a cached list stays valid
+LEASE_TTL = 5  # Seconds one request may spend refilling an expired entry
+LEASE_POLL_INTERVAL = 0.02  # Seconds between cache checks while another request refills
+LEASE_POLL_ATTEMPTS = 5  # Checks before giving up and querying the database
+
+# Keys for the cached list responses
+PATIENTS_KEY = "v1:patients:all"
+MEDICAL_TESTS_KEY = "v1:medical_tests:all"
+DIAGNOSIS_KEY = "v1:diagnosis:all"
+
+# Store the refilled value only if the lease still holds our token. A write
+# in the meantime deletes the lease, so a refill that read pre-write rows
+# never overwrites the invalidation.
+STORE_IF_LEASED = """
+if redis.call("GET", KEYS[2]) == ARGV[1] then
+    redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3])
+    redis.call("DEL", KEYS[2])
+    return 1
+end
+return 0
+"""
+
+def create_cache():
+    if not REDIS_URL:
+        return None
+    return redis.from_url(REDIS_URL)
+
+# Dependency: the shared Redis client, or None when caching is disabled
+def get_cache(request: Request):
+    return request.app.state.cache
+
+def lease_key(key):
+    return f"{key}:lease"
+
+# Look up a cached value. On a miss only one request takes the refill lease
+# and gets its token back; the others wait briefly for it to land, then
+# query the database themselves. Redis errors count as a miss without a
+# lease, so an unreachable cache only costs the database a read.
+async def get_or_lease(cache, key):
+    try:
+        value = await cache.get(key)
+        if value is not None:
+            return value, None
+        token = uuid.uuid4().hex
+        if await cache.set(lease_key(key), token, nx=True, ex=LEASE_TTL):
+            return None, token
+        for _ in range(LEASE_POLL_ATTEMPTS):
+            await asyncio.sleep(LEASE_POLL_INTERVAL)
+            value = await cache.get(key)
+            if value is not None:
+                return value, None
+    except redis.RedisError as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+    return None, None
+
+# Pass a streamed body through unchanged, then cache the complete value
+# if no write has invalidated the lease in the meantime
+async def tee_to_cache(cache, key, token, chunks):
+    body = []
+    async for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+    try:
+        await cache.eval(STORE_IF_LEASED, 2, key, lease_key(key), token, b"".join(body), CACHE_TTL)
+    except redis.RedisError as e:
+        logger.warning("Cache store failed for %s: %s", key, e)
+
+# Drop cached entries and any refill in progress after a write, so the
+# next read sees it. A failure is logged rather than raised: the write has
+# already been committed, and the entries still expire after CACHE_TTL.
+async def invalidate(cache, *keys):
+    if cache is None:
+        return
+    try:
+        await cache.delete(*keys, *(lease_key(key) for key in keys))
+    except redis.RedisError as e:
+        logger.warning("Cache invalidation failed for %s: %s", ", ".join(keys), e)
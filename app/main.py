@@ -1,184 +1,282 @@
+import logging
+import os
+import aiomysql
+import orjson
 from fastapi import FastAPI, HTTPException, Depends
-from pydantic import BaseModel, conint, confloat
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from typing import List
-from contextlib import contextmanager
-from app.connection import get_db_connection
+from contextlib import asynccontextmanager, contextmanager
+from app.cache import (
+    DIAGNOSIS_KEY, MEDICAL_TESTS_KEY, PATIENTS_KEY,
+    create_cache, get_cache, get_or_lease, invalidate, tee_to_cache
+)
+from app.connection import create_db_pool, get_db_pool
+from app.routing import ORJSONRoute
+from app.schemas import (
+    DiagnosisCreate, DiagnosisResponse, MedicalTestCreate, MedicalTestResponse,
+    PatientCreate, PatientResponse
+)
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
+
+# Open the connection pool and cache client on startup, release them on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.pool = await create_db_pool()
+    app.state.cache = create_cache()
+    yield
+    app.state.pool.close()
+    await app.state.pool.wait_closed()
+    if app.state.cache is not None:
+        await app.state.cache.aclose()
 
 # Initialize FastAPI App
-app = FastAPI()
-
-# Pydantic models for request validation
-class PatientCreate(BaseModel):
-    age: conint(ge=0, le=120)
-    gender: conint(ge=0, le=1)  # 1 for male, 0 for female
-
-class MedicalTestCreate(BaseModel):
-    patient_id: int
-    total_bilirubin: confloat(ge=0)
-    direct_bilirubin: confloat(ge=0)
-    alkaline_phosphatase: conint(ge=0)
-    alamine_aminotransferase: conint(ge=0)
-    aspartate_aminotransferase: conint(ge=0)
-    total_proteins: confloat(ge=0)
-    albumin: confloat(ge=0)
-    albumin_and_globulin_ratio: confloat(ge=0)
-
-class DiagnosisCreate(BaseModel):
-    patient_id: int
-    diagnosis: conint(ge=0, le=1)  # 1 for liver disease, 0 for no disease
-
-# Response models
-class PatientResponse(BaseModel):
-    patient_id: int
-    age: int
-    gender: int
-
-class MedicalTestResponse(BaseModel):
-    test_id: int
-    patient_id: int
-    total_bilirubin: float
-    direct_bilirubin: float
-    alkaline_phosphatase: int
-    alamine_aminotransferase: int
-    aspartate_aminotransferase: int
-    total_proteins: float
-    albumin: float
-    albumin_and_globulin_ratio: float
-
-class DiagnosisResponse(BaseModel):
-    diagnosis_id: int
-    patient_id: int
-    diagnosis: int
-
-# Context manager for database connection
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.router.route_class = ORJSONRoute
+
+# Compress larger responses (mostly the list endpoints) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Rows sent per executemany() call on the bulk endpoints
+BULK_CHUNK_SIZE = 1000
+
+# SQL statements, built once at import and shared by every request
+INSERT_PATIENT_SQL = "INSERT INTO patients (age, gender) VALUES (%s, %s)"
+SELECT_PATIENTS_SQL = "SELECT patient_id, age, gender FROM patients"
+UPDATE_PATIENT_SQL = "UPDATE patients SET age = %s, gender = %s WHERE patient_id = %s"
+DELETE_PATIENT_SQL = "DELETE FROM patients WHERE patient_id = %s"
+
+INSERT_MEDICAL_TEST_SQL = """
+INSERT INTO medical_tests (
+    patient_id, total_bilirubin, direct_bilirubin, alkaline_phosphatase,
+    alamine_aminotransferase, aspartate_aminotransferase, total_proteins,
+    albumin, albumin_and_globulin_ratio
+) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+SELECT_MEDICAL_TESTS_SQL = """
+SELECT test_id, patient_id, total_bilirubin, direct_bilirubin, alkaline_phosphatase,
+    alamine_aminotransferase, aspartate_aminotransferase, total_proteins,
+    albumin, albumin_and_globulin_ratio
+FROM medical_tests
+"""
+
+INSERT_DIAGNOSIS_SQL = "INSERT INTO diagnosis (patient_id, diagnosis) VALUES (%s, %s)"
+SELECT_DIAGNOSES_SQL = "SELECT diagnosis_id, patient_id, diagnosis FROM diagnosis"
+UPDATE_DIAGNOSIS_SQL = "UPDATE diagnosis SET patient_id = %s, diagnosis = %s WHERE diagnosis_id = %s"
+DELETE_DIAGNOSIS_SQL = "DELETE FROM diagnosis WHERE diagnosis_id = %s"
+
+def medical_test_row(test):
+    return (
+        test.patient_id, test.total_bilirubin, test.direct_bilirubin,
+        test.alkaline_phosphatase, test.alamine_aminotransferase,
+        test.aspartate_aminotransferase, test.total_proteins,
+        test.albumin, test.albumin_and_globulin_ratio
+    )
+
+# MySQL error code for a foreign key that references a missing row
+FK_VIOLATION = 1452
+
+# Let the patient_id foreign key do the existence check instead of a
+# separate SELECT, and report a violation as a 404
 @contextmanager
-def get_db_cursor():
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
+def missing_patient_as_404():
     try:
-        yield cursor
-        connection.commit()
-    except Exception as e:
-        connection.rollback()
-        raise e
-    finally:
-        cursor.close()
-        connection.close()
+        yield
+    except aiomysql.IntegrityError as e:
+        if e.args[0] == FK_VIOLATION:
+            raise HTTPException(status_code=404, detail="Patient not found")
+        raise
+
+# Context manager for a cursor on a connection borrowed from the pool.
+# The connection is only acquired here, inside the handler, so requests
+# that fail validation never take one. Connections run in autocommit mode;
+# pass transaction=True to group several statements under a single commit.
+@asynccontextmanager
+async def get_db_cursor(pool, transaction=False):
+    async with pool.acquire() as connection:
+        cursor = await connection.cursor()
+        try:
+            if transaction:
+                await connection.begin()
+            yield cursor
+            if transaction:
+                await connection.commit()
+        except Exception as e:
+            if transaction:
+                await connection.rollback()
+            raise e
+        finally:
+            await cursor.close()
+
+# Rows read from the server per fetch when streaming a result set
+STREAM_BATCH_SIZE = 500
+
+# Stream a result set as a JSON array straight from an unbuffered cursor,
+# so memory stays flat however large the table grows. The connection is
+# held until the last row is sent, not just for the handler's lifetime.
+async def stream_rows(pool, query):
+    async with pool.acquire() as connection:
+        async with connection.cursor(aiomysql.SSCursor) as cursor:
+            await cursor.execute(query)
+            # Plain tuple rows, keyed once per batch against the column names
+            columns = tuple(column[0] for column in cursor.description)
+            yield b"["
+            separator = b""
+            while rows := await cursor.fetchmany(STREAM_BATCH_SIZE):
+                yield separator + b",".join(
+                    orjson.dumps(dict(zip(columns, row)), default=float) for row in rows
+                )
+                separator = b","
+            yield b"]"
+
+# Serve a list endpoint from the cache when possible; otherwise stream it
+# from the database, caching the body if this request holds the refill lease
+async def list_response(pool, cache, key, query):
+    lease = None
+    if cache is not None:
+        cached, lease = await get_or_lease(cache, key)
+        if cached is not None:
+            return Response(cached, media_type="application/json")
+    body = stream_rows(pool, query)
+    if lease is not None:
+        body = tee_to_cache(cache, key, lease, body)
+    return StreamingResponse(body, media_type="application/json")
+
+# Create and update routes return dicts built from already-validated input,
+# so they skip response_model re-validation; `responses` keeps the schema in /docs.
 
 # Add a new patient
 
-@app.post("/patients/", response_model=PatientResponse)
-def create_patient(patient: PatientCreate):
-    with get_db_cursor() as cursor:
-        query = "INSERT INTO patients (age, gender) VALUES (%s, %s)"
-        cursor.execute(query, (patient.age, patient.gender))
+@app.post("/patients/", responses={200: {"model": PatientResponse}})
+async def create_patient(patient: PatientCreate, pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    async with get_db_cursor(pool) as cursor:
+        await cursor.execute(INSERT_PATIENT_SQL, (patient.age, patient.gender))
         patient_id = cursor.lastrowid
-        return {"patient_id": patient_id, **patient.dict()}
+    await invalidate(cache, PATIENTS_KEY)
+    return {"patient_id": patient_id, "age": patient.age, "gender": patient.gender}
+
+# Add many patients in one transaction
+
+@app.post("/patients/bulk")
+async def create_patients_bulk(patients: List[PatientCreate], pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    rows = [(patient.age, patient.gender) for patient in patients]
+    async with get_db_cursor(pool, transaction=True) as cursor:
+        # executemany() rewrites each chunk into a single multi-row INSERT
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            await cursor.executemany(INSERT_PATIENT_SQL, rows[start:start + BULK_CHUNK_SIZE])
+    await invalidate(cache, PATIENTS_KEY)
+    return {"inserted": len(rows)}
 
 # Get all patients
 
 @app.get("/patients/", response_model=List[PatientResponse])
-def get_patients():
-    with get_db_cursor() as cursor:
-        query = "SELECT * FROM patients"
-        cursor.execute(query)
-        patients = cursor.fetchall()
-        return patients
+async def get_patients(pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    return await list_response(pool, cache, PATIENTS_KEY, SELECT_PATIENTS_SQL)
 
 # Update a patient
 
-@app.put("/patients/{patient_id}", response_model=PatientResponse)
-def update_patient(patient_id: int, patient: PatientCreate):
-    with get_db_cursor() as cursor:
-        query = "UPDATE patients SET age = %s, gender = %s WHERE patient_id = %s"
-        cursor.execute(query, (patient.age, patient.gender, patient_id))
+@app.put("/patients/{patient_id}", responses={200: {"model": PatientResponse}})
+async def update_patient(patient_id: int, patient: PatientCreate, pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    async with get_db_cursor(pool) as cursor:
+        await cursor.execute(UPDATE_PATIENT_SQL, (patient.age, patient.gender, patient_id))
         if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Patient not found")
-        return {"patient_id": patient_id, **patient.dict()}
+    await invalidate(cache, PATIENTS_KEY)
+    return {"patient_id": patient_id, "age": patient.age, "gender": patient.gender}
 
 # Delete a patient
 
 @app.delete("/patients/{patient_id}")
-def delete_patient(patient_id: int):
-    with get_db_cursor() as cursor:
-        query = "DELETE FROM patients WHERE patient_id = %s"
-        cursor.execute(query, (patient_id,))
+async def delete_patient(patient_id: int, pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    async with get_db_cursor(pool) as cursor:
+        await cursor.execute(DELETE_PATIENT_SQL, (patient_id,))
         if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Patient not found")
-        return {"message": "Patient deleted successfully"}
+    # Child rows may have been removed by ON DELETE CASCADE
+    await invalidate(cache, PATIENTS_KEY, MEDICAL_TESTS_KEY, DIAGNOSIS_KEY)
+    return {"message": "Patient deleted successfully"}
 
 # Add a new medical test
 
-@app.post("/medical_tests/", response_model=MedicalTestResponse)
-def create_medical_test(test: MedicalTestCreate):
-    with get_db_cursor() as cursor:
-        query = """
-        INSERT INTO medical_tests (
-            patient_id, total_bilirubin, direct_bilirubin, alkaline_phosphatase,
-            alamine_aminotransferase, aspartate_aminotransferase, total_proteins,
-            albumin, albumin_and_globulin_ratio
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        cursor.execute(query, (
-            test.patient_id, test.total_bilirubin, test.direct_bilirubin,
-            test.alkaline_phosphatase, test.alamine_aminotransferase,
-            test.aspartate_aminotransferase, test.total_proteins,
-            test.albumin, test.albumin_and_globulin_ratio
-        ))
+@app.post("/medical_tests/", responses={200: {"model": MedicalTestResponse}})
+async def create_medical_test(test: MedicalTestCreate, pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    async with get_db_cursor(pool) as cursor:
+        with missing_patient_as_404():
+            await cursor.execute(INSERT_MEDICAL_TEST_SQL, medical_test_row(test))
         test_id = cursor.lastrowid
-        return {"test_id": test_id, **test.dict()}
+    await invalidate(cache, MEDICAL_TESTS_KEY)
+    return {
+        "test_id": test_id,
+        "patient_id": test.patient_id,
+        "total_bilirubin": test.total_bilirubin,
+        "direct_bilirubin": test.direct_bilirubin,
+        "alkaline_phosphatase": test.alkaline_phosphatase,
+        "alamine_aminotransferase": test.alamine_aminotransferase,
+        "aspartate_aminotransferase": test.aspartate_aminotransferase,
+        "total_proteins": test.total_proteins,
+        "albumin": test.albumin,
+        "albumin_and_globulin_ratio": test.albumin_and_globulin_ratio
+    }
+
+# Add many medical tests in one transaction
+
+@app.post("/medical_tests/bulk")
+async def create_medical_tests_bulk(tests: List[MedicalTestCreate], pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    rows = [medical_test_row(test) for test in tests]
+    async with get_db_cursor(pool, transaction=True) as cursor:
+        # executemany() rewrites each chunk into a single multi-row INSERT
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            with missing_patient_as_404():
+                await cursor.executemany(INSERT_MEDICAL_TEST_SQL, rows[start:start + BULK_CHUNK_SIZE])
+    await invalidate(cache, MEDICAL_TESTS_KEY)
+    return {"inserted": len(rows)}
 
 # Get all medical tests
 
 @app.get("/medical_tests/", response_model=List[MedicalTestResponse])
-def get_medical_tests():
-    with get_db_cursor() as cursor:
-        query = "SELECT * FROM medical_tests"
-        cursor.execute(query)
-        tests = cursor.fetchall()
-        return tests
+async def get_medical_tests(pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    return await list_response(pool, cache, MEDICAL_TESTS_KEY, SELECT_MEDICAL_TESTS_SQL)
 
 # Add a new diagnosis
 
-@app.post("/diagnosis/", response_model=DiagnosisResponse)
-def create_diagnosis(diagnosis: DiagnosisCreate):
-    with get_db_cursor() as cursor:
-        query = "INSERT INTO diagnosis (patient_id, diagnosis) VALUES (%s, %s)"
-        cursor.execute(query, (diagnosis.patient_id, diagnosis.diagnosis))
+@app.post("/diagnosis/", responses={200: {"model": DiagnosisResponse}})
+async def create_diagnosis(diagnosis: DiagnosisCreate, pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    async with get_db_cursor(pool) as cursor:
+        with missing_patient_as_404():
+            await cursor.execute(INSERT_DIAGNOSIS_SQL, (diagnosis.patient_id, diagnosis.diagnosis))
         diagnosis_id = cursor.lastrowid
-        return {"diagnosis_id": diagnosis_id, **diagnosis.dict()}
+    await invalidate(cache, DIAGNOSIS_KEY)
+    return {"diagnosis_id": diagnosis_id, "patient_id": diagnosis.patient_id, "diagnosis": diagnosis.diagnosis}
 
 # Get all diagnoses
 
 @app.get("/diagnosis/", response_model=List[DiagnosisResponse])
-def get_diagnoses():
-    with get_db_cursor() as cursor:
-        query = "SELECT * FROM diagnosis"
-        cursor.execute(query)
-        diagnoses = cursor.fetchall()
-        return diagnoses
+async def get_diagnoses(pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    return await list_response(pool, cache, DIAGNOSIS_KEY, SELECT_DIAGNOSES_SQL)
 
 # Update a diagnosis
 
-@app.put("/diagnosis/{diagnosis_id}", response_model=DiagnosisResponse)
-def update_diagnosis(diagnosis_id: int, diagnosis: DiagnosisCreate):
-    with get_db_cursor() as cursor:
-        query = "UPDATE diagnosis SET patient_id = %s, diagnosis = %s WHERE diagnosis_id = %s"
-        cursor.execute(query, (diagnosis.patient_id, diagnosis.diagnosis, diagnosis_id))
+@app.put("/diagnosis/{diagnosis_id}", responses={200: {"model": DiagnosisResponse}})
+async def update_diagnosis(diagnosis_id: int, diagnosis: DiagnosisCreate, pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    async with get_db_cursor(pool) as cursor:
+        with missing_patient_as_404():
+            await cursor.execute(UPDATE_DIAGNOSIS_SQL, (diagnosis.patient_id, diagnosis.diagnosis, diagnosis_id))
         if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Diagnosis not found")
-        return {"diagnosis_id": diagnosis_id, **diagnosis.dict()}
+    await invalidate(cache, DIAGNOSIS_KEY)
+    return {"diagnosis_id": diagnosis_id, "patient_id": diagnosis.patient_id, "diagnosis": diagnosis.diagnosis}
 
 # Delete a diagnosis
 
 @app.delete("/diagnosis/{diagnosis_id}")
-def delete_diagnosis(diagnosis_id: int):
-    with get_db_cursor() as cursor:
-        query = "DELETE FROM diagnosis WHERE diagnosis_id = %s"
-        cursor.execute(query, (diagnosis_id,))
+async def delete_diagnosis(diagnosis_id: int, pool=Depends(get_db_pool), cache=Depends(get_cache)):
+    async with get_db_cursor(pool) as cursor:
+        await cursor.execute(DELETE_DIAGNOSIS_SQL, (diagnosis_id,))
         if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Diagnosis not found")
-        return {"message": "Diagnosis deleted successfully"}
+    await invalidate(cache, DIAGNOSIS_KEY)
+    return {"message": "Diagnosis deleted successfully"}
 
 # Root endpoint
 @app.get("/")
@@ -0,0 +1,22 @@
+import orjson
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+# Request that decodes JSON bodies with orjson instead of the stdlib json module
+class ORJSONRequest(Request):
+    async def json(self):
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so
+            # FastAPI still turns malformed bodies into a 422
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+# Route class that hands FastAPI's body parsing an ORJSONRequest
+class ORJSONRoute(APIRoute):
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def orjson_route_handler(request: Request):
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return orjson_route_handler
@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import Annotated
+
+# Pydantic models for request validation
+class PatientCreate(BaseModel):
+    age: Annotated[int, Field(ge=0, le=120)]
+    gender: Annotated[int, Field(ge=0, le=1)]  # 1 for male, 0 for female
+
+class MedicalTestCreate(BaseModel):
+    patient_id: int
+    total_bilirubin: Annotated[float, Field(ge=0)]
+    direct_bilirubin: Annotated[float, Field(ge=0)]
+    alkaline_phosphatase: Annotated[int, Field(ge=0)]
+    alamine_aminotransferase: Annotated[int, Field(ge=0)]
+    aspartate_aminotransferase: Annotated[int, Field(ge=0)]
+    total_proteins: Annotated[float, Field(ge=0)]
+    albumin: Annotated[float, Field(ge=0)]
+    albumin_and_globulin_ratio: Annotated[float, Field(ge=0)]
+
+class DiagnosisCreate(BaseModel):
+    patient_id: int
+    diagnosis: Annotated[int, Field(ge=0, le=1)]  # 1 for liver disease, 0 for no disease
+
+# Response models
+class PatientResponse(BaseModel):
+    patient_id: int
+    age: int
+    gender: int
+
+class MedicalTestResponse(BaseModel):
+    test_id: int
+    patient_id: int
+    total_bilirubin: float
+    direct_bilirubin: float
+    alkaline_phosphatase: int
+    alamine_aminotransferase: int
+    aspartate_aminotransferase: int
+    total_proteins: float
+    albumin: float
+    albumin_and_globulin_ratio: float
+
+class DiagnosisResponse(BaseModel):
+    diagnosis_id: int
+    patient_id: int
+    diagnosis: int
@@ -0,0 +1,38 @@
+-- Make sure patient lookups and joins on the child tables use an index.
+--
+-- The foreign keys on medical_tests.patient_id and diagnosis.patient_id
+-- (the API relies on them to report missing patients) already require an
+-- index with patient_id as its leading column, and InnoDB creates one
+-- automatically when the schema does not define it. On such a schema this
+-- migration changes nothing. It only adds an index where patient_id is not
+-- the leading column of any existing index, e.g. a copy of the tables made
+-- without their foreign keys, and is safe to re-run.
+--
+-- Verify with: EXPLAIN SELECT * FROM medical_tests WHERE patient_id = 1;
+-- (the `key` column should name an index rather than NULL)
+
+SET @sql = IF(
+    EXISTS (
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'medical_tests'
+          AND COLUMN_NAME = 'patient_id' AND SEQ_IN_INDEX = 1
+    ),
+    'DO 0',
+    'CREATE INDEX idx_mt_patient ON medical_tests (patient_id)'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @sql = IF(
+    EXISTS (
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'diagnosis'
+          AND COLUMN_NAME = 'patient_id' AND SEQ_IN_INDEX = 1
+    ),
+    'DO 0',
+    'CREATE INDEX idx_diag_patient ON diagnosis (patient_id)'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
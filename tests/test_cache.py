@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+import redis.asyncio as redis
+
+from app import cache as app_cache
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis needs lupa to run the store script
+
+KEY = app_cache.PATIENTS_KEY
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+async def drain(stream):
+    return b"".join([chunk async for chunk in stream])
+
+# Stand-in client for an unreachable Redis server
+class BrokenCache:
+    async def _fail(self, *args, **kwargs):
+        raise redis.ConnectionError("connection refused")
+
+    get = set = delete = eval = _fail
+
+def test_refill_is_stored_by_lease_holder():
+    async def run():
+        cache = fakeredis.FakeAsyncRedis()
+        value, token = await app_cache.get_or_lease(cache, KEY)
+        assert value is None and token is not None
+        assert await drain(app_cache.tee_to_cache(cache, KEY, token, chunks(b"[", b"]"))) == b"[]"
+        assert await cache.get(KEY) == b"[]"
+        assert await cache.get(app_cache.lease_key(KEY)) is None
+        assert await app_cache.get_or_lease(cache, KEY) == (b"[]", None)
+
+    asyncio.run(run())
+
+def test_write_during_refill_is_not_overwritten():
+    async def run():
+        cache = fakeredis.FakeAsyncRedis()
+        _, token = await app_cache.get_or_lease(cache, KEY)
+        # A write commits and invalidates while the refill is still streaming
+        await app_cache.invalidate(cache, KEY)
+        await drain(app_cache.tee_to_cache(cache, KEY, token, chunks(b"[stale]")))
+        assert await cache.get(KEY) is None
+
+    asyncio.run(run())
+
+def test_stale_refill_cannot_overwrite_newer_lease():
+    async def run():
+        cache = fakeredis.FakeAsyncRedis()
+        _, old_token = await app_cache.get_or_lease(cache, KEY)
+        await app_cache.invalidate(cache, KEY)
+        _, new_token = await app_cache.get_or_lease(cache, KEY)
+        await drain(app_cache.tee_to_cache(cache, KEY, old_token, chunks(b"[stale]")))
+        assert await cache.get(KEY) is None
+        await drain(app_cache.tee_to_cache(cache, KEY, new_token, chunks(b"[fresh]")))
+        assert await cache.get(KEY) == b"[fresh]"
+
+    asyncio.run(run())
+
+def test_waiter_falls_back_to_database_quickly():
+    async def run():
+        cache = fakeredis.FakeAsyncRedis()
+        await app_cache.get_or_lease(cache, KEY)  # Another request holds the lease
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        assert await app_cache.get_or_lease(cache, KEY) == (None, None)
+        assert loop.time() - started < 0.5
+
+    asyncio.run(run())
+
+def test_redis_errors_degrade_to_no_cache():
+    async def run():
+        cache = BrokenCache()
+        assert await app_cache.get_or_lease(cache, KEY) == (None, None)
+        await app_cache.invalidate(cache, KEY)
+        assert await drain(app_cache.tee_to_cache(cache, KEY, "token", chunks(b"[", b"]"))) == b"[]"
+
+    asyncio.run(run())